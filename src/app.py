@@ -7,17 +7,22 @@ for extracurricular activities at Mergington High School.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
+import orjson
+from pydantic import EmailStr
+import asyncio
 import os
+import time
+from collections import defaultdict
 from pathlib import Path
 
 app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
+              description="API for viewing and signing up for extracurricular activities",
+              default_response_class=ORJSONResponse)
 
 # Mount the static files directory
-current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
+app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"),
+          name="static")
 
 # In-memory activity database
 activities = {
@@ -41,6 +46,38 @@ activities = {
     }
 }
 
+# Store participants as sets so membership checks on signup are O(1);
+# the snapshot builder converts back to lists at the JSON boundary
+for _activity in activities.values():
+    _activity["participants"] = set(_activity["participants"])
+
+
+# Short-TTL cache of the JSON bytes served by GET /activities. The payload
+# is encoded once on refresh and repeat reads within the TTL return the
+# same bytes; signups invalidate the cache so writes stay visible.
+ACTIVITIES_CACHE_TTL = float(os.getenv("ACTIVITIES_CACHE_TTL", "2.0"))
+_activities_cache = {"bytes": b"", "expires": 0.0}
+
+
+def _build_activities_snapshot():
+    """Build a JSON-ready copy of the activities, decoupled from the live data"""
+    return {name: {**data, "participants": sorted(data["participants"])}
+            for name, data in activities.items()}
+
+
+def _refresh_activities_cache():
+    _activities_cache["bytes"] = orjson.dumps(_build_activities_snapshot())
+    _activities_cache["expires"] = time.monotonic() + ACTIVITIES_CACHE_TTL
+    return _activities_cache["bytes"]
+
+
+def _invalidate_activities_cache():
+    _activities_cache["expires"] = 0.0
+
+
+# Prime the cache at import time so the first request is served warm
+_refresh_activities_cache()
+
 
 @app.get("/")
 def root():
@@ -49,19 +86,43 @@ def root():
 
 @app.get("/activities")
 def get_activities():
-    return activities
+    if time.monotonic() >= _activities_cache["expires"]:
+        _refresh_activities_cache()
+    return Response(content=_activities_cache["bytes"],
+                    media_type="application/json")
+
+
+# One lock per activity: concurrent signups to different activities
+# proceed in parallel, while signups to the same activity serialize
+# their check-then-add against each other
+_signup_locks = defaultdict(asyncio.Lock)
+
+# Shared exception instances for the signup error paths; FastAPI only
+# reads status_code/detail, so raising the same object avoids an
+# allocation on every failed request
+_ERR_NOT_FOUND = HTTPException(status_code=404, detail="Activity not found")
+_ERR_ALREADY_SIGNED_UP = HTTPException(status_code=400,
+                                       detail="Student is already signed up")
+_ERR_ACTIVITY_FULL = HTTPException(status_code=400, detail="Activity is full")
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+async def signup_for_activity(activity_name: str, email: EmailStr):
     """Sign up a student for an activity"""
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+    # Single lookup doubles as the existence check
+    activity = activities.get(activity_name)
+    if activity is None:
+        raise _ERR_NOT_FOUND
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    async with _signup_locks[activity_name]:
+        # Validate capacity and non-membership before mutating
+        participants = activity["participants"]
+        if email in participants:
+            raise _ERR_ALREADY_SIGNED_UP
+        if len(participants) >= activity["max_participants"]:
+            raise _ERR_ACTIVITY_FULL
 
-    # Add student
-    activity["participants"].append(email)
+        # Add student
+        participants.add(email)
+        _invalidate_activities_cache()
     return {"message": f"Signed up {email} for {activity_name}"}